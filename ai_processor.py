@@ -1,12 +1,74 @@
-import google.generativeai as genai
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from config import GEMINI_API_KEY # API 키는 config.py 또는 환경변수에서 관리
-
-# Google Gemini API 초기화
-genai.configure(api_key=GEMINI_API_KEY)
+from config import FACTS_CHUNK_PARAGRAPHS, FACTS_CHUNK_MAX_CHARS, FACTS_MAX_WORKERS
+from database import get_article_paragraph_hashes, save_article_paragraph_hashes, get_chunk_facts, save_chunk_facts
+from database import get_stage_checkpoint, save_stage_checkpoint
 
 # 사용할 모델 (비용 효율적인 최신 Flash 모델 권장)
 GEMINI_MODEL_NAME = 'gemini-2.0-flash' 
 
+# 단계별 프롬프트 버전 (프롬프트를 수정하면 해당 단계의 버전을 올려 이후 단계의 체크포인트를 무효화)
+FACTS_PROMPT_VERSION = 1
+ANNOTATE_PROMPT_VERSION = 1
+SUMMARY_PROMPT_VERSION = 1
+
+# google.generativeai 는 import 비용이 크므로 최초 사용 시점에 불러옵니다.
+_genai = None
+_genai_lock = threading.Lock()
+
+def _get_genai():
+    """google.generativeai 모듈을 (필요할 때 한 번만) 불러오고 API 키를 설정하여 반환"""
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                genai.configure(api_key=GEMINI_API_KEY)
+                _genai = genai
+    return _genai
+
+# 스레드별로 활성화된 Gemini 호출 집계기 (캐시 예열 예산 계산용)
+_call_counter = threading.local()
+
+class GeminiCallCounter:
+    """with 블록 안에서 현재 스레드(및 그 스레드가 띄운 사실 추출 작업)의 Gemini 호출 수를 집계
+
+    다른 스레드에서 처리 중인 사용자 요청의 호출은 포함되지 않습니다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+    def __enter__(self):
+        self._previous = getattr(_call_counter, 'counter', None)
+        _call_counter.counter = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _call_counter.counter = self._previous
+
+def _generate_content(prompt):
+    """Gemini 모델로 프롬프트를 처리하고, 활성화된 집계기가 있으면 호출 횟수를 기록"""
+    counter = getattr(_call_counter, 'counter', None)
+    if counter is not None:
+        counter.increment()
+    model = _get_genai().GenerativeModel(GEMINI_MODEL_NAME)
+    return model.generate_content(prompt)
+
+def warm_up():
+    """Gemini SDK를 미리 불러와 첫 요청의 지연을 줄임 (백그라운드 예열용)"""
+    try:
+        _get_genai()
+    except Exception as e:
+        print(f"Gemini SDK 예열 오류: {e}")
+
 def extract_facts_from_article(article_text):
     """기사 내용에서 숨겨진 의도와 편향성을 고려하여 검증 가능한 핵심 사실만 추출
     
@@ -17,8 +79,6 @@ def extract_facts_from_article(article_text):
         추출된 비판적으로 검토된 사실 텍스트
     """
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-        
         prompt = f"""
         당신은 매우 예리하고 비판적인 뉴스 분석가입니다. 다음 뉴스 기사를 분석하여, 다음 원칙에 따라 핵심적인 '사실'만을 추출해주십시오.
 
@@ -44,13 +104,110 @@ def extract_facts_from_article(article_text):
         </기사>
         """
         
-        response = model.generate_content(prompt)
+        response = _generate_content(prompt)
         return response.text
     
     except Exception as e:
         print(f"사실 추출 AI 처리 오류: {e}")
         return f"AI 처리 중 오류가 발생했습니다: {str(e)}"
 
+def _hash_text(text):
+    """공백을 정규화한 텍스트의 SHA-256 해시"""
+    return hashlib.sha256(" ".join(text.split()).encode('utf-8')).hexdigest()
+
+def split_paragraphs(article_text):
+    """기사 텍스트를 순서가 유지된 문단 리스트로 분리 (빈 줄 제외)"""
+    return [line.strip() for line in article_text.splitlines() if line.strip()]
+
+def chunk_paragraphs(paragraphs, paragraph_hashes):
+    """문단들을 사실 추출 단위(청크)로 묶음
+    
+    청크 경계를 문단 해시로 결정하므로(content-defined chunking), 문단 하나가 추가/수정되어도
+    해당 문단이 속한 청크만 바뀌고 나머지 청크는 그대로 유지됩니다.
+    
+    Args:
+        paragraphs: 문단 텍스트 리스트
+        paragraph_hashes: 각 문단의 해시 리스트
+        
+    Returns:
+        (문단 리스트, 문단 해시 리스트) 튜플의 리스트
+    """
+    chunks = []
+    current_paragraphs, current_hashes, current_length = [], [], 0
+    for paragraph, paragraph_hash in zip(paragraphs, paragraph_hashes):
+        current_paragraphs.append(paragraph)
+        current_hashes.append(paragraph_hash)
+        current_length += len(paragraph)
+        if int(paragraph_hash[:8], 16) % FACTS_CHUNK_PARAGRAPHS == 0 or current_length >= FACTS_CHUNK_MAX_CHARS:
+            chunks.append((current_paragraphs, current_hashes))
+            current_paragraphs, current_hashes, current_length = [], [], 0
+    if current_paragraphs:
+        chunks.append((current_paragraphs, current_hashes))
+    return chunks
+
+def extract_facts_incrementally(article_text, article_url=None):
+    """문단 청크 단위로 사실을 추출하되, 이전에 처리한 청크는 캐시된 결과를 재사용
+    
+    기사가 수정되어 다시 가져온 경우, 새로 추가되거나 변경된 문단이 속한 청크만
+    extract_facts_from_article 로 처리합니다.
+    
+    Args:
+        article_text: 기사 전체 내용 텍스트
+        article_url: 기사 URL (주어지면 문단 해시 목록을 저장하여 변경 문단 수를 기록)
+        
+    Returns:
+        청크 순서대로 이어 붙인 사실 텍스트 (오류 시 오류 메시지)
+    """
+    paragraphs = split_paragraphs(article_text)
+    paragraph_hashes = [_hash_text(paragraph) for paragraph in paragraphs]
+    
+    if article_url:
+        previous_hashes = set(get_article_paragraph_hashes(article_url))
+        if previous_hashes:
+            changed = sum(1 for paragraph_hash in paragraph_hashes if paragraph_hash not in previous_hashes)
+            print(f"이전에 처리한 기사입니다. 변경/추가된 문단: {changed}/{len(paragraphs)}")
+    
+    chunks = chunk_paragraphs(paragraphs, paragraph_hashes)
+    chunk_keys = [
+        _hash_text(f"{GEMINI_MODEL_NAME}\nfacts-v{FACTS_PROMPT_VERSION}\n" + "\n".join(hashes))
+        for _, hashes in chunks
+    ]
+    chunk_results = [get_chunk_facts(chunk_key) for chunk_key in chunk_keys]
+    
+    missing = [idx for idx, facts in enumerate(chunk_results) if facts is None]
+    print(f"사실 추출 청크 {len(chunks)}개 중 {len(chunks) - len(missing)}개 캐시 재사용")
+    if missing:
+        # 작업 스레드의 호출도 호출한 스레드의 집계기에 기록되도록 전달
+        counter = getattr(_call_counter, 'counter', None)
+        
+        def extract_chunk(idx):
+            _call_counter.counter = counter
+            return extract_facts_from_article("\n".join(chunks[idx][0]))
+        
+        with ThreadPoolExecutor(max_workers=min(FACTS_MAX_WORKERS, len(missing))) as executor:
+            extracted = list(executor.map(extract_chunk, missing))
+        
+        # 일부 청크가 실패해도 성공한 청크는 모두 저장하여 재시도 시 다시 처리하지 않도록 함
+        first_error = None
+        for idx, facts in zip(missing, extracted):
+            if "AI 처리 중 오류가 발생했습니다" in facts:
+                first_error = first_error or facts
+                continue
+            save_chunk_facts(chunk_keys[idx], facts)
+            chunk_results[idx] = facts
+        if first_error:
+            return first_error
+    
+    if article_url:
+        save_article_paragraph_hashes(article_url, paragraph_hashes)
+    
+    return "\n\n".join(facts.strip() for facts in chunk_results)
+
+def estimate_gemini_calls(article_text):
+    """캐시와 체크포인트 없이 process_article 을 실행할 때의 최대 Gemini 호출 수 (청크 수 + 주석/요약 2회)"""
+    paragraphs = split_paragraphs(article_text)
+    return len(chunk_paragraphs(paragraphs, [_hash_text(paragraph) for paragraph in paragraphs])) + 2
+
 def neutralize_and_annotate_facts(facts_text):
     """추출된 사실에 대해 비판적 분석, 다각적 관점 및 균형을 위한 주석 추가
     
@@ -61,8 +218,6 @@ def neutralize_and_annotate_facts(facts_text):
         다각적 분석 및 균형 잡힌 주석이 추가된 텍스트
     """
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-        
         prompt = f"""
         당신은 균형감각과 비판적 사고 능력이 뛰어난 팩트체커 겸 해설가입니다. 다음은 1차적으로 추출된 뉴스 기사의 '사실' 정보입니다. 이 내용을 바탕으로, 독자가 사안을 다각적이고 균형 있게 이해할 수 있도록 심층 분석하고, 필요한 주석을 추가해주십시오.
 
@@ -82,7 +237,7 @@ def neutralize_and_annotate_facts(facts_text):
         </추출된 사실>
         """
         
-        response = model.generate_content(prompt)
+        response = _generate_content(prompt)
         return response.text
     
     except Exception as e:
@@ -99,8 +254,6 @@ def summarize_for_readability(annotated_text):
         균형 잡힌 시각을 제공하는 최종 요약본 (HTML 형식)
     """
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-        
         prompt = f"""주어진 <주석이 추가된 텍스트>를 바탕으로, 다른 부가적인 설명이나 인사말 없이, 독자가 사건의 핵심을 파악하고 다양한 관점을 고려하며 균형 잡힌 시각을 가질 수 있도록 명확하고 간결하게 오직 아래의 **출력 스타일 및 형식 지침**과 **요약 원칙**에 따라서 최종 요약 내용만을 작성해주십시오. 주석 또한 내용에 포함하여도 좋습니다(적절한 말머리 또는 태그 적용)
 
 **출력 스타일 및 형식 지침:**
@@ -128,37 +281,67 @@ def summarize_for_readability(annotated_text):
 </주석이 추가된 텍스트>
 """
         
-        response = model.generate_content(prompt)
+        response = _generate_content(prompt)
         return response.text
     
     except Exception as e:
         print(f"요약 AI 처리 오류: {e}")
         return f"AI 처리 중 오류가 발생했습니다: {str(e)}"
 
-def process_article(article_text):
+def _stage_prompt_versions():
+    """단계별 체크포인트 버전 문자열
+
+    각 단계의 출력은 이전 단계들의 프롬프트에도 의존하므로, 해당 단계까지의 버전을 모두 이어 붙입니다.
+    (예: 요약 프롬프트만 바뀌면 1, 2단계 체크포인트는 그대로 재사용됩니다.)
+    """
+    facts_version = f"{GEMINI_MODEL_NAME}/facts-v{FACTS_PROMPT_VERSION}"
+    annotate_version = f"{facts_version}/annotate-v{ANNOTATE_PROMPT_VERSION}"
+    summary_version = f"{annotate_version}/summary-v{SUMMARY_PROMPT_VERSION}"
+    return {'facts': facts_version, 'annotate': annotate_version, 'summary': summary_version}
+
+def _run_stage(article_hash, stage, prompt_version, stage_func, *args):
+    """체크포인트가 있으면 재사용하고, 없으면 단계를 실행한 뒤 성공한 결과만 체크포인트로 저장"""
+    output = get_stage_checkpoint(article_hash, stage, prompt_version)
+    if output is not None:
+        print(f"'{stage}' 단계 체크포인트 재사용")
+        return output
+    
+    output = stage_func(*args)
+    if "AI 처리 중 오류가 발생했습니다" not in output:
+        save_stage_checkpoint(article_hash, stage, prompt_version, output)
+    return output
+
+def process_article(article_text, article_url=None):
     """기사 전체 처리 과정 (비판적 사실 추출 -> 다각적 분석/주석 -> 균형 잡힌 요약)
     
     Args:
         article_text: 기사 전체 내용 텍스트
+        article_url: 기사 URL (주어지면 문단 변경 내역을 기록하여 갱신된 기사를 증분 처리)
         
     Returns:
         최종 처리된 균형 잡힌 요약본
+    
+    각 단계의 결과는 기사 해시와 단계별 프롬프트 버전으로 체크포인트되므로,
+    실패 후 재시도하거나 뒷 단계 프롬프트만 바뀐 경우 마지막으로 완료된 단계부터 이어서 처리합니다.
     """
     try:
+        article_hash = _hash_text(article_text)
+        versions = _stage_prompt_versions()
+        
         print("1단계: 비판적 사실 추출 중...")
-        facts = extract_facts_from_article(article_text)
+        facts = _run_stage(article_hash, 'facts', versions['facts'], extract_facts_incrementally, article_text, article_url)
         if "AI 처리 중 오류가 발생했습니다" in facts:
             return facts 
         print("사실 추출 완료:\n", facts)
         
         print("\n2단계: 중립화 및 주석 추가 중...")
-        annotated = neutralize_and_annotate_facts(facts)
+        annotated = _run_stage(article_hash, 'annotate', versions['annotate'], neutralize_and_annotate_facts, facts)
         if "AI 처리 중 오류가 발생했습니다" in annotated:
             return annotated
         print("중립화 및 주석 추가 완료:\n", annotated)
         
         print("\n3단계: 가독성 높은 요약 중...")
-        summary = summarize_for_readability(annotated)
+        summary = _run_stage(article_hash, 'summary', versions['summary'], summarize_for_readability, annotated)
         if "AI 처리 중 오류가 발생했습니다" in summary:
             return summary
         print("요약 완료:\n", summary)
@@ -189,6 +372,9 @@ if __name__ == '__main__':
     "정부와 시장 참여자 간의 신뢰 회복과 장기적인 관점에서의 접근이 중요하다"고 조언했다.
     """
 
+    from database import init_db
+    init_db() # 사실 추출 캐시 및 단계별 체크포인트 테이블 생성
+
     print(">>> 기사 원문:\n", sample_article_text)
     print("\n>>> AI 처리 시작...")
     
@@ -0,0 +1,142 @@
+import threading
+import time
+from config import (
+    SEARCH_CACHE_TTL_SECONDS, ARTICLE_CACHE_TTL_SECONDS, CACHE_WARM_INTERVAL_SECONDS, CACHE_WARM_TOP_K,
+    CACHE_WARM_ARTICLES_PER_KEYWORD, CACHE_WARM_GEMINI_BUDGET
+)
+from crawler import fetch_news_headlines_and_links, fetch_article_content
+from preprocessor import preprocess_article
+from ai_processor import process_article, estimate_gemini_calls, GeminiCallCounter
+from query_log import normalize_keyword, get_top_keywords, flush as flush_query_log
+
+# 검색 결과 캐시 (정규화된 키워드 -> (저장 시각, 뉴스 목록))
+search_cache = {}
+# 기사 본문 캐시 (기사 URL -> (저장 시각, 본문 텍스트))
+article_cache = {}
+_cache_lock = threading.Lock()
+
+def _get_fresh(cache, key, ttl):
+    with _cache_lock:
+        entry = cache.get(key)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+def _store(cache, key, value, ttl):
+    now = time.monotonic()
+    with _cache_lock:
+        # 만료된 항목 정리
+        for expired_key in [k for k, (stored_at, _) in cache.items() if now - stored_at >= ttl]:
+            del cache[expired_key]
+        cache[key] = (now, value)
+
+def is_article_content(content):
+    """fetch_article_content 결과가 오류 안내가 아닌 실제 본문인지 여부"""
+    return bool(content) and not content.startswith("기사를 가져오는 중 오류가 발생했습니다") and content != "기사 본문을 찾을 수 없습니다."
+
+def search_news(site_config, keyword, count=10):
+    """캐시를 거쳐 키워드 뉴스 검색 (캐시에 없거나 만료되면 크롤링)
+
+    Args:
+        site_config: 사이트 설정 정보 딕셔너리
+        keyword: 검색할 키워드
+        count: 가져올 뉴스 개수
+
+    Returns:
+        뉴스 헤드라인과 링크 리스트
+    """
+    cache_key = normalize_keyword(keyword)
+    news_list = _get_fresh(search_cache, cache_key, SEARCH_CACHE_TTL_SECONDS)
+    if news_list is not None and len(news_list) >= count:
+        return news_list[:count]
+
+    news_list = fetch_news_headlines_and_links(site_config, keyword, count=count)
+    if news_list:
+        _store(search_cache, cache_key, news_list, SEARCH_CACHE_TTL_SECONDS)
+    return news_list
+
+def get_article_content(article_url, site_config):
+    """캐시를 거쳐 기사 본문 추출 (오류 응답은 캐시하지 않음)
+
+    기사 수정을 빨리 반영하도록 검색 결과보다 짧은 ARTICLE_CACHE_TTL_SECONDS 동안만 캐시합니다.
+
+    Args:
+        article_url: 기사 URL
+        site_config: 사이트 설정 정보 딕셔너리
+
+    Returns:
+        기사 본문 텍스트
+    """
+    content = _get_fresh(article_cache, article_url, ARTICLE_CACHE_TTL_SECONDS)
+    if content is not None:
+        return content
+
+    content = fetch_article_content(article_url, site_config)
+    if is_article_content(content):
+        _store(article_cache, article_url, content, ARTICLE_CACHE_TTL_SECONDS)
+    return content
+
+def warm_once(site_config):
+    """인기 키워드를 다시 크롤링하고 상위 기사를 미리 요약
+
+    요약 결과는 process_article 의 단계별 체크포인트에 저장되므로, 사용자가 같은 기사를
+    선택하면 AI 처리 없이 바로 응답합니다. 예열 스레드 자신의 Gemini 호출만 집계하며,
+    기사별 예상 호출 수(청크 수 + 2)가 남은 CACHE_WARM_GEMINI_BUDGET 을 넘으면 그 기사는 건너뜁니다.
+
+    Args:
+        site_config: 사이트 설정 정보 딕셔너리
+
+    Returns:
+        이번 예열에서 사용한 Gemini 호출 수
+    """
+    flush_query_log()
+
+    with GeminiCallCounter() as counter:
+        for keyword in get_top_keywords(CACHE_WARM_TOP_K):
+            news_list = fetch_news_headlines_and_links(site_config, keyword, count=10)
+            if not news_list:
+                continue
+            _store(search_cache, keyword, news_list, SEARCH_CACHE_TTL_SECONDS)
+
+            for news_item in news_list[:CACHE_WARM_ARTICLES_PER_KEYWORD]:
+                if counter.count >= CACHE_WARM_GEMINI_BUDGET:
+                    print(f"캐시 예열 Gemini 예산 소진 ({counter.count}/{CACHE_WARM_GEMINI_BUDGET})")
+                    return counter.count
+
+                # 수정된 기사를 반영하도록 예열 때마다 캐시를 거치지 않고 다시 가져옴
+                content = fetch_article_content(news_item['url'], site_config)
+                if not is_article_content(content):
+                    continue
+                _store(article_cache, news_item['url'], content, ARTICLE_CACHE_TTL_SECONDS)
+                # 전처리 결과가 너무 짧으면 preprocess_article 이 원문으로 대체하고 로그를 남김
+                cleaned_content, _ = preprocess_article(content)
+                if not cleaned_content:
+                    continue
+
+                estimated_calls = estimate_gemini_calls(cleaned_content)
+                remaining_calls = CACHE_WARM_GEMINI_BUDGET - counter.count
+                if estimated_calls > remaining_calls:
+                    print(f"캐시 예열 예산 부족으로 기사 건너뜀 (예상 {estimated_calls}회 > 남은 {remaining_calls}회): {news_item['url']}")
+                    continue
+                process_article(cleaned_content, news_item['url'])
+
+        return counter.count
+
+def start_cache_warmer(get_site_config):
+    """백그라운드 스레드에서 주기적으로 인기 키워드 캐시 예열 시작
+
+    Args:
+        get_site_config: 예열 시점의 사이트 설정 딕셔너리를 반환하는 함수
+    """
+    def run():
+        while True:
+            try:
+                site_config = get_site_config()
+                if site_config:
+                    used_calls = warm_once(site_config)
+                    print(f"캐시 예열 완료 (Gemini 호출 {used_calls}회)")
+            except Exception as e:
+                print(f"캐시 예열 오류: {e}")
+            time.sleep(CACHE_WARM_INTERVAL_SECONDS)
+
+    threading.Thread(target=run, name="cache-warmer", daemon=True).start()
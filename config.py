@@ -15,4 +15,41 @@ DB_PATH = "newsutral.db"
 
 # 대화 상태 정의 (키워드 기반으로 변경)
 ASKING_KEYWORD, SELECTING_KEYWORD_NEWS = range(2)
-# SELECTING_SITE, SELECTING_NEWS = range(2) # 이전 상태 정의는 주석 처리 또는 삭제 
\ No newline at end of file
+# SELECTING_SITE, SELECTING_NEWS = range(2) # 이전 상태 정의는 주석 처리 또는 삭제 
+
+# 봇이 업데이트 수신을 시작한 뒤 무거운 SDK(Gemini, requests/bs4)를 백그라운드에서 미리 불러올지 여부
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() in ("1", "true", "yes")
+
+
+# AI 처리 캐시(단계별 체크포인트, 청크별 사실, 기사 문단 해시) 보관 일수
+CACHE_RETENTION_DAYS = 7
+CACHE_PRUNE_INTERVAL_SECONDS = 6 * 3600    # 오래된 캐시 정리 주기 (봇 시작 시 한 번 + 이 주기마다)
+
+# 1단계 사실 추출을 위한 문단 묶음(청크) 설정
+# 청크 경계는 문단 내용의 해시로 정해지므로, 문단이 추가/수정되어도 주변 청크의 캐시는 재사용됩니다.
+FACTS_CHUNK_PARAGRAPHS = 4       # 청크당 평균 문단 수
+FACTS_CHUNK_MAX_CHARS = 2000     # 청크 최대 글자 수
+FACTS_MAX_WORKERS = 4            # 캐시에 없는 청크를 동시에 처리할 최대 작업 수
+
+# 기사 전처리 규칙 (preprocessor.py 의 기본 규칙에 추가할 정규식)
+PREPROCESS_EXTRA_DROP_LINE_PATTERNS = []   # 일치하면 줄 전체를 제거
+PREPROCESS_EXTRA_STRIP_PATTERNS = []       # 일치하는 부분만 줄에서 제거
+ESTIMATED_CHARS_PER_TOKEN = 2.0            # 토큰 절감량 추정용 (공백 제외 글자 수 / 토큰)
+PREPROCESS_MIN_KEEP_RATIO = 0.3            # 전처리 후 남은 분량이 원문 대비 이 비율 미만이면 원문 사용
+
+# 검색 키워드 기록 (handle_keyword 에서 모아 두었다가 일정 개수/시간마다 한 번에 DB 에 기록)
+QUERY_LOG_BATCH_SIZE = 20            # 모아 둔 검색 수가 이 값 이상이면 기록
+QUERY_LOG_FLUSH_SECONDS = 60         # 마지막 기록 후 이 시간(초)이 지나면 기록
+QUERY_LOG_RETENTION_HOURS = 72       # 시간대별 집계 보관 기간
+TRENDING_WINDOW_HOURS = 6            # 인기 키워드 집계 구간
+
+# 검색 결과 / 기사 본문 캐시 유효 시간(초). 기사 수정을 빨리 반영하도록 본문은 더 짧게 캐시
+SEARCH_CACHE_TTL_SECONDS = 900
+ARTICLE_CACHE_TTL_SECONDS = 120
+
+# 인기 키워드 캐시 예열 (Gemini 비용이 발생하므로 기본값은 꺼져 있음)
+CACHE_WARMER_ENABLED = os.getenv("CACHE_WARMER_ENABLED", "false").lower() in ("1", "true", "yes")
+CACHE_WARM_INTERVAL_SECONDS = 600    # 예열 주기
+CACHE_WARM_TOP_K = 5                 # 예열할 인기 키워드 수
+CACHE_WARM_ARTICLES_PER_KEYWORD = 3  # 키워드별로 미리 요약할 상위 기사 수
+CACHE_WARM_GEMINI_BUDGET = 60        # 예열 1회당 최대 Gemini 호출 수
@@ -1,9 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
 import time
 import random
 from urllib.parse import urljoin, quote
 
+# requests / BeautifulSoup 는 import 비용이 크므로 각 함수에서 필요할 때 불러옵니다.
+
+def warm_up():
+    """HTTP/HTML 파싱 라이브러리를 미리 불러와 첫 크롤링의 지연을 줄임 (백그라운드 예열용)"""
+    try:
+        import requests  # noqa: F401
+        from bs4 import BeautifulSoup  # noqa: F401
+    except Exception as e:
+        print(f"크롤러 라이브러리 예열 오류: {e}")
+
 def fetch_news_headlines_and_links(site_config, keyword, count=10):
     """특정 키워드로 뉴스 사이트에서 헤드라인과 링크 추출
     
@@ -17,6 +25,9 @@ def fetch_news_headlines_and_links(site_config, keyword, count=10):
     """
     full_url = ""
     try:
+        import requests
+        from bs4 import BeautifulSoup
+
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -114,6 +125,9 @@ def fetch_article_content(article_url, site_config):
         기사 본문 텍스트
     """
     try:
+        import requests
+        from bs4 import BeautifulSoup
+
         # 요청 헤더 설정
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
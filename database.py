@@ -1,5 +1,5 @@
 import sqlite3
-from config import DB_PATH
+from config import DB_PATH, CACHE_RETENTION_DAYS
 
 def init_db():
     """데이터베이스 초기화 및 테이블 생성"""
@@ -55,6 +55,68 @@ def init_db():
         VALUES (?, ?, ?, ?, ?, ?)
         """, site)
     
+    # article_paragraphs 테이블 생성 (기사별 문단 해시를 순서대로 저장, 기사 갱신 감지용)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS article_paragraphs (
+        article_url TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        paragraph_hash TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (article_url, position)
+    )
+    ''')
+    
+    # chunk_facts 테이블 생성 (문단 묶음(청크) 해시별 1단계 사실 추출 결과 캐시)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS chunk_facts (
+        chunk_hash TEXT PRIMARY KEY,
+        facts TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    
+    # stage_checkpoints 테이블 생성 (기사 해시 + 단계별 프롬프트 버전별 AI 처리 결과, 실패 후 재시도 시 재사용)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS stage_checkpoints (
+        article_hash TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        output TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (article_hash, stage, prompt_version)
+    )
+    ''')
+    
+    # keyword_counts 테이블 생성 (정규화된 검색 키워드의 시간대별 집계, 인기 키워드 캐시 예열용)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS keyword_counts (
+        keyword TEXT NOT NULL,
+        hour_bucket INTEGER NOT NULL,
+        query_count INTEGER NOT NULL,
+        PRIMARY KEY (keyword, hour_bucket)
+    )
+    ''')
+    
+    conn.commit()
+    conn.close()
+
+def prune_expired_cache(retention_days=CACHE_RETENTION_DAYS):
+    """보관 기간이 지난 AI 처리 캐시(단계별 체크포인트, 청크별 사실, 기사 문단 해시) 삭제
+    
+    Args:
+        retention_days: 보관 일수 (이보다 오래된 행은 삭제)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cutoff = f"-{int(retention_days)} days"
+    cursor.execute("DELETE FROM stage_checkpoints WHERE created_at < datetime('now', ?)", (cutoff,))
+    cursor.execute("DELETE FROM chunk_facts WHERE created_at < datetime('now', ?)", (cutoff,))
+    cursor.execute(
+        "DELETE FROM article_paragraphs WHERE updated_at < datetime('now', ?)",
+        (cutoff,)
+    )
+    
     conn.commit()
     conn.close()
 
@@ -93,4 +155,168 @@ def get_managed_site_config(site_id_or_name):
     result = dict(row) if row else None
     
     conn.close()
-    return result 
\ No newline at end of file
+    return result
+
+def get_article_paragraph_hashes(article_url):
+    """기사에 대해 마지막으로 저장된 문단 해시 목록 반환
+    
+    Args:
+        article_url: 기사 URL
+    
+    Returns:
+        문단 순서대로 정렬된 해시 리스트 (저장된 적 없으면 빈 리스트)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        "SELECT paragraph_hash FROM article_paragraphs WHERE article_url = ? ORDER BY position",
+        (article_url,)
+    )
+    result = [row[0] for row in cursor.fetchall()]
+    
+    conn.close()
+    return result
+
+def save_article_paragraph_hashes(article_url, paragraph_hashes):
+    """기사의 문단 해시 목록을 순서대로 저장 (기존 목록은 교체)
+    
+    Args:
+        article_url: 기사 URL
+        paragraph_hashes: 문단 순서대로 정렬된 해시 리스트
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("DELETE FROM article_paragraphs WHERE article_url = ?", (article_url,))
+    cursor.executemany(
+        "INSERT INTO article_paragraphs (article_url, position, paragraph_hash) VALUES (?, ?, ?)",
+        [(article_url, position, paragraph_hash) for position, paragraph_hash in enumerate(paragraph_hashes)]
+    )
+    
+    conn.commit()
+    conn.close()
+
+def get_chunk_facts(chunk_hash):
+    """청크 해시에 해당하는 캐시된 사실 추출 결과 반환
+    
+    Args:
+        chunk_hash: 청크 해시
+    
+    Returns:
+        캐시된 사실 텍스트 또는 None
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT facts FROM chunk_facts WHERE chunk_hash = ?", (chunk_hash,))
+    row = cursor.fetchone()
+    
+    conn.close()
+    return row[0] if row else None
+
+def save_chunk_facts(chunk_hash, facts):
+    """청크 해시별 사실 추출 결과 저장
+    
+    Args:
+        chunk_hash: 청크 해시
+        facts: 추출된 사실 텍스트
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        "INSERT OR REPLACE INTO chunk_facts (chunk_hash, facts) VALUES (?, ?)",
+        (chunk_hash, facts)
+    )
+    
+    conn.commit()
+    conn.close()
+
+def get_stage_checkpoint(article_hash, stage, prompt_version):
+    """기사의 특정 처리 단계 체크포인트 반환
+    
+    Args:
+        article_hash: 기사 본문 해시
+        stage: 처리 단계 이름 ('facts', 'annotate', 'summary')
+        prompt_version: 해당 단계까지의 프롬프트 버전 문자열
+    
+    Returns:
+        저장된 단계 출력 텍스트 또는 None
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        "SELECT output FROM stage_checkpoints WHERE article_hash = ? AND stage = ? AND prompt_version = ?",
+        (article_hash, stage, prompt_version)
+    )
+    row = cursor.fetchone()
+    
+    conn.close()
+    return row[0] if row else None
+
+def save_stage_checkpoint(article_hash, stage, prompt_version, output):
+    """기사의 특정 처리 단계 출력을 체크포인트로 저장
+    
+    Args:
+        article_hash: 기사 본문 해시
+        stage: 처리 단계 이름 ('facts', 'annotate', 'summary')
+        prompt_version: 해당 단계까지의 프롬프트 버전 문자열
+        output: 단계 출력 텍스트
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        "INSERT OR REPLACE INTO stage_checkpoints (article_hash, stage, prompt_version, output) VALUES (?, ?, ?, ?)",
+        (article_hash, stage, prompt_version, output)
+    )
+    
+    conn.commit()
+    conn.close()
+
+def add_keyword_counts(keyword_counts, hour_bucket, oldest_bucket):
+    """시간대별 키워드 검색 횟수를 한 번에 누적하고 보관 기간이 지난 집계는 삭제
+    
+    Args:
+        keyword_counts: (정규화된 키워드, 검색 횟수) 튜플 리스트
+        hour_bucket: 집계할 시간대 (epoch 기준 시간 단위)
+        oldest_bucket: 보관할 가장 오래된 시간대 (이보다 오래된 집계는 삭제)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.executemany("""
+    INSERT INTO keyword_counts (keyword, hour_bucket, query_count) VALUES (?, ?, ?)
+    ON CONFLICT (keyword, hour_bucket) DO UPDATE SET query_count = query_count + excluded.query_count
+    """, [(keyword, hour_bucket, count) for keyword, count in keyword_counts])
+    cursor.execute("DELETE FROM keyword_counts WHERE hour_bucket < ?", (oldest_bucket,))
+    
+    conn.commit()
+    conn.close()
+
+def get_trending_keywords(since_bucket, limit):
+    """특정 시간대 이후 가장 많이 검색된 키워드 반환
+    
+    Args:
+        since_bucket: 집계를 시작할 시간대 (epoch 기준 시간 단위)
+        limit: 반환할 최대 키워드 수
+    
+    Returns:
+        (키워드, 검색 횟수) 튜플 리스트 (검색 횟수 내림차순)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+    SELECT keyword, SUM(query_count) AS total FROM keyword_counts
+    WHERE hour_bucket >= ?
+    GROUP BY keyword
+    ORDER BY total DESC, MAX(hour_bucket) DESC
+    LIMIT ?
+    """, (since_bucket, limit))
+    result = cursor.fetchall()
+    
+    conn.close()
+    return result
@@ -0,0 +1,457 @@
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import math
+import random
+import sys
+import tempfile
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, quote, urlparse
+
+import ai_processor
+import database
+import main as bot
+
+FAKE_BOT_TOKEN = "123456:LOAD-TEST-TOKEN"
+FAKE_BOT_USER = {"id": 123456, "is_bot": True, "first_name": "LoadTestBot", "username": "load_test_bot"}
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'preprocess_corpus.json')
+
+# 단계 응답이 오류로 간주되는 문구 (main.py 의 사용자 안내 메시지 기준)
+ERROR_MARKERS = ("오류", "찾지 못했습니다", "가져오지 못했습니다", "만료")
+
+STEPS = ("start", "keyword", "select")
+
+def _percentile(values, percent):
+    """nearest-rank 방식 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+def _rss_mb():
+    """현재 프로세스의 최대 RSS(MB). resource 모듈이 없는 환경(Windows)에서는 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """클라이언트가 먼저 연결을 끊은 경우(종료 시 getUpdates 롱폴링 등)의 오류는 출력하지 않는 HTTP 서버"""
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+def _start_server(handler_class):
+    """로컬 포트에 HTTP 서버를 띄우고 (서버, 기본 주소) 반환"""
+    server = _QuietHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# --- 가짜 텔레그램 Bot API 서버 ---
+
+class FakeTelegramServer:
+    """봇이 호출하는 Bot API 요청을 기록하고, 가상 사용자의 업데이트를 getUpdates 로 전달"""
+
+    def __init__(self, on_bot_call):
+        self._on_bot_call = on_bot_call
+        self._pending_updates = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._condition = threading.Condition()
+        self.server, address = _start_server(self._make_handler())
+        self.base_url = f"{address}/bot"
+
+    def push_update(self, update):
+        """가상 사용자의 업데이트를 큐에 추가"""
+        with self._condition:
+            update['update_id'] = self._next_update_id
+            self._next_update_id += 1
+            self._pending_updates.append(update)
+            self._condition.notify_all()
+
+    def _get_updates(self, params):
+        offset = int(params.get('offset') or 0)
+        timeout = min(float(params.get('timeout') or 0), 1.0)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                self._pending_updates = [u for u in self._pending_updates if u['update_id'] >= offset]
+                if self._pending_updates or time.monotonic() >= deadline:
+                    return list(self._pending_updates)
+                self._condition.wait(deadline - time.monotonic())
+
+    def _message(self, params, message_id=None):
+        with self._condition:
+            if message_id is None:
+                message_id = self._next_message_id
+                self._next_message_id += 1
+        return {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": params.get('chat_id'), "type": "private"},
+            "from": FAKE_BOT_USER,
+            "text": params.get('text', ''),
+        }
+
+    def handle(self, method, params):
+        """Bot API 메서드별 응답 생성"""
+        if method == 'getMe':
+            return dict(FAKE_BOT_USER, can_join_groups=True, can_read_all_group_messages=False,
+                        supports_inline_queries=False)
+        if method == 'getUpdates':
+            return self._get_updates(params)
+        if method == 'sendMessage':
+            result = self._message(params)
+        elif method == 'editMessageText':
+            result = self._message(params, params.get('message_id'))
+        else:
+            # deleteWebhook, deleteMessage, answerCallbackQuery 등
+            result = True
+        self._on_bot_call(method, params, time.perf_counter(), result)
+        return result
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                method = urlparse(self.path).path.rsplit('/', 1)[-1]
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8')
+                if self.headers.get('Content-Type', '').startswith('application/json'):
+                    params = json.loads(body or '{}')
+                else:
+                    # python-telegram-bot 은 각 값을 JSON 문자열로 인코딩한 form 데이터로 전송
+                    params = {}
+                    for key, values in parse_qs(body).items():
+                        try:
+                            params[key] = json.loads(values[0])
+                        except ValueError:
+                            params[key] = values[0]
+                payload = json.dumps({"ok": True, "result": fake.handle(method, params)}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+# --- 가짜 네이버 뉴스 서버 ---
+
+class FakeNaverServer:
+    """네이버 검색 결과 페이지와 기사 페이지를 기록된 픽스처 기사로 응답"""
+
+    def __init__(self, latency_ms=50, results_per_keyword=10):
+        with open(CORPUS_PATH, encoding='utf-8') as f:
+            self.articles = [article['text'] for article in json.load(f)]
+        self.latency_ms = latency_ms
+        self.results_per_keyword = results_per_keyword
+        self.server, self.base_url = _start_server(self._make_handler())
+
+    def site_config(self, site_config):
+        """실제 네이버 설정에서 검색 주소만 가짜 서버로 바꾼 설정"""
+        return dict(
+            site_config,
+            base_url=self.base_url,
+            headlines_section_url=f"{self.base_url}/search.naver?where=news&query=",
+        )
+
+    def search_page(self, keyword):
+        key = hashlib.sha1(keyword.encode('utf-8')).hexdigest()[:8]
+        items = []
+        for idx in range(self.results_per_keyword):
+            url = f"{self.base_url}/n.news.naver.com/article/{key}/{idx}?query={quote(keyword)}"
+            items.append(
+                '<div class="sds-comps-vertical-layout sds-comps-full-layout dZQQMujvOqnxG1bUQsg6">'
+                f'<a class="n6AJosQA40hUOAe_Vplg cdv6mdm2_kpW2D6slkm6" href="{self.base_url}/press/{key}/{idx}">'
+                f'<span class="sds-comps-text sds-comps-text-type-headline1">{escape(keyword)} 관련 기사 {idx + 1}</span></a>'
+                '<span class="sds-comps-profile-info-subtext">'
+                f'<a class="n6AJosQA40hUOAe_Vplg" href="{url}"><span>네이버뉴스</span></a></span>'
+                '</div>'
+            )
+        return f"<html><body>{''.join(items)}</body></html>"
+
+    def article_page(self, key, idx, keyword):
+        text = self.articles[int(key, 16) % len(self.articles)]
+        paragraphs = [f"{keyword} 관련 기사 {idx + 1}번의 본문이다."] + [line for line in text.splitlines() if line.strip()]
+        body = ''.join(f"<p>{escape(paragraph)}</p>" for paragraph in paragraphs)
+        return f'<html><body><div id="newsct_article">{body}</div></body></html>'
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(fake.latency_ms / 1000)
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                keyword = query.get('query', [''])[0]
+                parts = parsed.path.strip('/').split('/')
+                if parsed.path.startswith('/search.naver'):
+                    html = fake.search_page(keyword)
+                elif parts[:2] == ['n.news.naver.com', 'article'] and len(parts) == 4:
+                    html = fake.article_page(parts[2], int(parts[3]), keyword)
+                else:
+                    self.send_error(404)
+                    return
+                payload = html.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+# --- 가짜 Gemini ---
+
+class FakeGemini:
+    """google.generativeai 대체 객체 (지연 시간과 오류율 조절 가능)
+
+    실제 SDK 처럼 동기 호출로 대기하므로, 봇의 이벤트 루프 차단도 그대로 재현됩니다.
+    """
+
+    def __init__(self, latency_ms=1500, jitter_ms=500, error_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def configure(self, **kwargs):
+        pass
+
+    def GenerativeModel(self, model_name):
+        fake = self
+
+        class Model:
+            def generate_content(self, prompt):
+                with fake._lock:
+                    fake.calls += 1
+                time.sleep(max(0.0, random.gauss(fake.latency_ms, fake.jitter_ms)) / 1000)
+                if random.random() < fake.error_rate:
+                    raise RuntimeError("가짜 Gemini 오류 (부하 테스트)")
+                digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]
+                return SimpleNamespace(text=f"<b>가짜 요약</b> {digest}\n- 부하 테스트용 응답입니다.")
+
+        return Model()
+
+# --- 부하 테스트 실행 ---
+
+class LoadTest:
+    """가상 사용자들이 start -> keyword -> select 흐름을 실행하고 단계별 지연 시간을 수집"""
+
+    def __init__(self, args):
+        self.args = args
+        self.loop = None
+        self.chat_queues = {}
+        self.latencies = {step: [] for step in STEPS}
+        self.attempts = {step: 0 for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+        self.loop_lags = []
+
+    def _on_bot_call(self, method, params, timestamp, result):
+        """가짜 텔레그램 서버 스레드에서 호출됨 -> 해당 사용자 큐로 전달"""
+        chat_id = params.get('chat_id')
+        if chat_id in self.chat_queues:
+            self.loop.call_soon_threadsafe(self.chat_queues[chat_id].put_nowait, (method, params, timestamp, result))
+
+    async def _wait_for_reply(self, chat_id, step):
+        """단계의 최종 응답(시작 안내 또는 버튼이 달린 메시지)을 기다림
+
+        Returns:
+            (응답 시각, 파라미터, 결과) 튜플
+        """
+        queue = self.chat_queues[chat_id]
+        while True:
+            method, params, timestamp, result = await queue.get()
+            if method not in ('sendMessage', 'editMessageText'):
+                continue
+            if step == 'start' or params.get('reply_markup'):
+                return timestamp, params, result
+
+    async def _run_step(self, chat_id, step, update):
+        """업데이트를 보내고 최종 응답까지의 지연 시간을 기록. 성공 시 응답 (파라미터, 결과) 반환"""
+        self.attempts[step] += 1
+        started = time.perf_counter()
+        self.telegram.push_update(update)
+        try:
+            timestamp, params, result = await asyncio.wait_for(
+                self._wait_for_reply(chat_id, step), self.args.step_timeout
+            )
+        except asyncio.TimeoutError:
+            self.errors[step] += 1
+            return None
+        self.latencies[step].append((timestamp - started) * 1000)
+        if any(marker in params.get('text', '') for marker in ERROR_MARKERS):
+            self.errors[step] += 1
+            return None
+        return params, result
+
+    async def simulate_user(self, user_idx):
+        """가상 사용자 한 명의 start -> keyword -> select 흐름"""
+        chat_id = 10_000 + user_idx
+        user = {"id": chat_id, "is_bot": False, "first_name": f"user{user_idx}"}
+        chat = {"id": chat_id, "type": "private"}
+        self.chat_queues[chat_id] = asyncio.Queue()
+
+        await asyncio.sleep(random.uniform(0, self.args.ramp_up))
+
+        start_update = {"message": {
+            "message_id": 1, "date": int(time.time()), "chat": chat, "from": user, "text": "/start",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+        }}
+        if await self._run_step(chat_id, 'start', start_update) is None:
+            return
+
+        await asyncio.sleep(self.args.think_time)
+        keyword = f"키워드{user_idx % self.args.keywords}"
+        keyword_update = {"message": {
+            "message_id": 2, "date": int(time.time()), "chat": chat, "from": user, "text": keyword,
+        }}
+        reply = await self._run_step(chat_id, 'keyword', keyword_update)
+        if reply is None:
+            return
+        params, result = reply
+
+        await asyncio.sleep(self.args.think_time)
+        buttons = [button['callback_data'] for row in params['reply_markup']['inline_keyboard'] for button in row
+                   if button.get('callback_data', '').startswith('news_')]
+        select_update = {"callback_query": {
+            "id": f"cb{user_idx}", "from": user, "chat_instance": str(chat_id),
+            "data": random.choice(buttons), "message": result,
+        }}
+        await self._run_step(chat_id, 'select', select_update)
+
+    async def monitor_loop_lag(self, interval=0.05):
+        """이벤트 루프가 예정 시각보다 얼마나 늦게 깨어나는지 측정 (동기 호출로 인한 차단 지표)"""
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            self.loop_lags.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    async def run(self):
+        """가짜 서버를 띄우고 실제 Application 으로 부하 테스트 실행"""
+        self.loop = asyncio.get_running_loop()
+        self.telegram = FakeTelegramServer(self._on_bot_call)
+        naver = FakeNaverServer(self.args.naver_latency_ms)
+        self.gemini = FakeGemini(self.args.gemini_latency_ms, self.args.gemini_jitter_ms, self.args.gemini_error_rate)
+
+        # 실제 핸들러는 그대로 두고, 외부 의존성(네이버 주소, Gemini SDK)만 가짜로 연결
+        ai_processor._get_genai = lambda: self.gemini
+        real_site_config = bot.get_managed_site_config
+        bot.get_managed_site_config = lambda site: naver.site_config(real_site_config(site))
+
+        application = bot.build_application(
+            token=FAKE_BOT_TOKEN, base_url=self.telegram.base_url,
+            concurrent_updates=self.args.concurrent_updates
+        )
+        await application.initialize()
+        if application.post_init:
+            await application.post_init(application)
+        await application.start()
+        await application.updater.start_polling(poll_interval=0.0, timeout=1)
+
+        rss_start = _rss_mb()
+        lag_task = asyncio.create_task(self.monitor_loop_lag())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(self.simulate_user(idx) for idx in range(self.args.users)))
+        finally:
+            elapsed = time.perf_counter() - started
+            lag_task.cancel()
+            await application.updater.stop()
+            await application.stop()
+            await application.shutdown()
+            self.telegram.server.shutdown()
+            naver.server.shutdown()
+
+        rss_end = _rss_mb()
+        rss_growth = rss_end - rss_start if rss_start is not None else None
+        return elapsed, rss_growth
+
+    def print_report(self, elapsed, rss_growth):
+        """단계별 지연 시간, 이벤트 루프 지연, 메모리 증가, 오류율 출력"""
+        def fmt(value):
+            return f"{value:9.0f}" if value is not None else f"{'-':>9}"
+
+        print(f"\n=== 부하 테스트 결과 (사용자 {self.args.users}명, {elapsed:.1f}초) ===")
+        print(f"{'단계':<8}{'요청':>6}{'오류':>6}{'p50(ms)':>9}{'p95(ms)':>9}{'p99(ms)':>9}{'max(ms)':>9}")
+        for step in STEPS:
+            latencies = self.latencies[step]
+            print(f"{step:<8}{self.attempts[step]:>6}{self.errors[step]:>6}"
+                  f"{fmt(_percentile(latencies, 50))}{fmt(_percentile(latencies, 95))}"
+                  f"{fmt(_percentile(latencies, 99))}{fmt(max(latencies) if latencies else None)}")
+
+        total_requests = sum(self.attempts.values())
+        total_errors = sum(self.errors.values())
+        error_rate = total_errors / total_requests * 100 if total_requests else 0.0
+        print(f"\n오류율: {error_rate:.1f}% ({total_errors}/{total_requests})")
+        print(f"이벤트 루프 지연: p50 {_percentile(self.loop_lags, 50) or 0:.0f} ms, "
+              f"p99 {_percentile(self.loop_lags, 99) or 0:.0f} ms, max {max(self.loop_lags, default=0):.0f} ms")
+        print(f"최대 RSS 증가: {rss_growth:.1f} MB" if rss_growth is not None else "최대 RSS 증가: 측정 불가")
+        print(f"가짜 Gemini 호출 수: {self.gemini.calls}")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="가짜 텔레그램/네이버/Gemini 서버를 상대로 실제 봇 핸들러에 다중 사용자 부하를 줍니다."
+    )
+    parser.add_argument("--users", type=int, default=20, help="동시 가상 사용자 수")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="사용자 시작 시점을 분산할 구간(초)")
+    parser.add_argument("--think-time", type=float, default=0.5, help="단계 사이 사용자 대기 시간(초)")
+    parser.add_argument("--keywords", type=int, default=10, help="사용자들이 나눠 쓰는 서로 다른 키워드 수")
+    parser.add_argument("--step-timeout", type=float, default=180.0, help="단계별 응답 제한 시간(초)")
+    parser.add_argument("--naver-latency-ms", type=float, default=50, help="가짜 네이버 응답 지연(ms)")
+    parser.add_argument("--gemini-latency-ms", type=float, default=1500, help="가짜 Gemini 평균 응답 지연(ms)")
+    parser.add_argument("--gemini-jitter-ms", type=float, default=500, help="가짜 Gemini 응답 지연 표준편차(ms)")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="가짜 Gemini 오류 확률 (0~1)")
+    parser.add_argument("--concurrent-updates", action="store_true", help="Application 의 동시 업데이트 처리 사용")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    parser.add_argument("--verbose", action="store_true", help="봇 로그와 처리 과정 출력 표시")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    load_test = LoadTest(args)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 실제 DB 를 건드리지 않도록 임시 DB 사용
+        database.DB_PATH = os.path.join(tmp_dir, "load_test.db")
+        database.init_db()
+
+        if args.verbose:
+            elapsed, rss_growth = asyncio.run(load_test.run())
+        else:
+            logging.getLogger().setLevel(logging.WARNING)
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed, rss_growth = asyncio.run(load_test.run())
+
+    load_test.print_report(elapsed, rss_growth)
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,23 @@
 import logging
+import threading
+import time
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ConversationHandler, MessageHandler, filters, ContextTypes
 from telegram.error import BadRequest
 
-from config import TELEGRAM_BOT_TOKEN
+from config import TELEGRAM_BOT_TOKEN, WARMUP_ON_START, CACHE_WARMER_ENABLED, CACHE_PRUNE_INTERVAL_SECONDS
 # 상태 정의를 config.py에서 가져오거나 여기서 명시적으로 정의합니다.
 # 예시: ASKING_KEYWORD, SELECTING_KEYWORD_NEWS = range(2) # config.py로 옮기는 것을 권장
 # 아래는 main.py에 직접 정의하는 경우
 ASKING_KEYWORD, SELECTING_KEYWORD_NEWS = range(2)
 
-from database import init_db, get_managed_site_config
-from crawler import fetch_news_headlines_and_links, fetch_article_content
-from ai_processor import process_article
+from database import init_db, get_managed_site_config, prune_expired_cache
+# crawler / ai_processor 는 무거운 SDK(requests, bs4, google.generativeai)를 최초 사용 시점에 불러옵니다.
+from crawler import warm_up as warm_up_crawler
+from ai_processor import process_article, warm_up as warm_up_ai
+from preprocessor import preprocess_article
+from query_log import record_query, flush as flush_query_log
+from cache_warmer import search_news, get_article_content, is_article_content, start_cache_warmer
 
 # 로깅 설정
 logging.basicConfig(
@@ -47,6 +53,9 @@ async def handle_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     keyword = update.message.text
     user_id = update.message.from_user.id
     
+    # 인기 키워드 집계 (일정 개수/시간마다 한 번에 DB 기록)
+    record_query(keyword)
+    
     site_config = get_managed_site_config("네이버 뉴스")
     if not site_config:
         await update.message.reply_text("네이버 뉴스 설정을 찾을 수 없습니다. 관리자에게 문의하세요.")
@@ -54,7 +63,7 @@ async def handle_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     loading_message = await update.message.reply_text(f"'{keyword}'에 대한 뉴스를 네이버에서 검색 중입니다...")
     
-    news_list = fetch_news_headlines_and_links(site_config, keyword, count=10)
+    news_list = search_news(site_config, keyword, count=10)
     
     try:
         await loading_message.delete()
@@ -114,9 +123,22 @@ async def select_keyword_news(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     await query.edit_message_text(f"선택하신 기사를 분석 중입니다...\n\n제목: {selected_news['title']}")
     
-    article_content = fetch_article_content(selected_news['url'], site_config)
+    article_content = get_article_content(selected_news['url'], site_config)
+    
+    fetch_failed = not is_article_content(article_content)
+    
+    if not fetch_failed:
+        # AI 처리 전 상투적 문구(바이라인, 저작권 문구, 사진 설명 등) 제거
+        article_content, preprocess_report = preprocess_article(article_content)
+        if preprocess_report['fallback']:
+            logger.warning(f"전처리 후 남은 내용이 너무 적어 원문을 사용합니다: {selected_news['url']}")
+        logger.info(
+            f"기사 전처리 완료: 추정 토큰 {preprocess_report['original_tokens']} -> {preprocess_report['cleaned_tokens']} "
+            f"({preprocess_report['tokens_saved']} 절감, 제거된 줄 {len(preprocess_report['removed_lines'])}개)"
+        )
     
-    if not article_content or article_content.startswith("기사를 가져오는 중 오류가 발생했습니다") or article_content == "기사 본문을 찾을 수 없습니다.":
+    if fetch_failed or not article_content:
+        article_content = article_content or "기사 본문이 비어 있습니다."
         keyboard = [
             [InlineKeyboardButton(f"'{current_keyword}' 목록으로 돌아가기", callback_data=f"keyword_showlist")],
             [InlineKeyboardButton("다른 키워드로 검색하기", callback_data="ask_keyword_again")]
@@ -129,7 +151,7 @@ async def select_keyword_news(update: Update, context: ContextTypes.DEFAULT_TYPE
         return SELECTING_KEYWORD_NEWS
     
     await query.edit_message_text(f"AI가 기사를 분석 중입니다... (시간이 좀 걸릴 수 있어요)\n\n제목: {selected_news['title']}")
-    summary_html = process_article(article_content)
+    summary_html = process_article(article_content, selected_news['url'])
     
     title_raw = selected_news['title']
     url_raw = selected_news['url']
@@ -300,10 +322,60 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     news_cache.pop(user.id, None) 
     return ConversationHandler.END
 
-def main():
-    """메인 함수"""
+def warm_up_heavy_modules():
+    """지연 로딩되는 무거운 모듈들을 미리 불러옴 (첫 사용자 요청의 지연 감소)"""
+    warm_up_crawler()
+    warm_up_ai()
+    logger.info("백그라운드 예열 완료 (crawler, ai_processor)")
+
+def prune_cache_periodically():
+    """보관 기간이 지난 AI 처리 캐시를 봇 시작 시 한 번, 이후 CACHE_PRUNE_INTERVAL_SECONDS 마다 정리"""
+    while True:
+        try:
+            prune_expired_cache()
+        except Exception as e:
+            logger.error(f"캐시 정리 오류: {e}")
+        time.sleep(CACHE_PRUNE_INTERVAL_SECONDS)
+
+async def post_init(application: Application) -> None:
+    """애플리케이션 초기화 직후(폴링 시작 직전) 호출되어 백그라운드 예열을 시작"""
+    # 캐시 예열 스레드가 사용하는 테이블 생성
+    init_db()
+    
+    if WARMUP_ON_START:
+        # 업데이트 수신을 막지 않도록 별도 데몬 스레드에서 실행
+        threading.Thread(target=warm_up_heavy_modules, name="warm-up", daemon=True).start()
+    
+    if CACHE_WARMER_ENABLED:
+        start_cache_warmer(lambda: get_managed_site_config("네이버 뉴스"))
+    
+    # 전체 테이블을 훑는 DELETE 이므로 요청 처리(/start) 경로가 아닌 별도 데몬 스레드에서 주기적으로 실행
+    threading.Thread(target=prune_cache_periodically, name="cache-pruner", daemon=True).start()
+
+async def post_shutdown(application: Application) -> None:
+    """애플리케이션 종료 시 아직 기록되지 않은 검색 키워드 집계를 DB 에 기록"""
+    flush_query_log()
+
+def build_application(token=TELEGRAM_BOT_TOKEN, base_url=None, concurrent_updates=False):
+    """애플리케이션 생성 및 핸들러 등록 (부하 테스트 등에서 재사용)
+    
+    Args:
+        token: 텔레그램 봇 토큰
+        base_url: 텔레그램 Bot API 주소 (None 이면 기본 주소, 부하 테스트 시 가짜 서버 주소)
+        concurrent_updates: 여러 업데이트를 동시에 처리할지 여부
+        
+    Returns:
+        핸들러가 등록된 Application
+    """
     # 애플리케이션 생성
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    builder = (
+        Application.builder().token(token)
+        .post_init(post_init).post_shutdown(post_shutdown)
+        .concurrent_updates(concurrent_updates)
+    )
+    if base_url:
+        builder = builder.base_url(base_url)
+    application = builder.build()
     
     # 대화 핸들러 설정
     conv_handler = ConversationHandler(
@@ -325,6 +397,12 @@ def main():
     # 대화 핸들러 등록
     application.add_handler(conv_handler)
     
+    return application
+
+def main():
+    """메인 함수"""
+    application = build_application()
+    
     # 봇 실행
     application.run_polling()
 
@@ -0,0 +1,140 @@
+import json
+import os
+import re
+from config import PREPROCESS_EXTRA_DROP_LINE_PATTERNS, PREPROCESS_EXTRA_STRIP_PATTERNS, ESTIMATED_CHARS_PER_TOKEN
+from config import PREPROCESS_MIN_KEEP_RATIO
+
+# 줄 전체를 제거할 패턴 (저작권 문구, 기자 바이라인, 사진 설명 등)
+DEFAULT_DROP_LINE_PATTERNS = [
+    # 푸터 규칙은 본문 문장과 겹치지 않도록 줄 전체가 푸터 형식일 때만 일치 (선택적 <>/[]/() 괄호, 짧은 언론사명, 길이 제한)
+    r'^[<\[(]?\s*([^\s,]{1,15}\s*,?\s*)?무단\s*전재\s*[및·,\-]?\s*재배포\s*(,?\s*(및\s*)?AI\s*학습\s*(및\s*)?(활용|이용))?\s*금지\s*[>\])]?$',  # "무단전재 및 재배포 금지"
+    r'^[<\[(]?\s*(ⓒ|©|\(c\)|copyright\b|저작권자\s*[(ⓒ©]).{0,100}$',         # "<저작권자(c) 연합뉴스, ...>", "ⓒ 뉴스1코리아, ..."
+    r'^[<\[(]?\s*AI\s*학습\s*(및\s*)?(활용|이용)\s*금지\s*[>\])]?$',                # "AI 학습 및 활용 금지" 단독 줄
+    r'^[가-힣]{2,4}\s*(기자|특파원|객원기자|인턴기자)\s*\(?[\w.+-]+@[\w-]+(\.[\w-]+)+\)?$',  # "홍길동 기자 (hong@news.com)"
+    r'^[\w.+-]+@[\w-]+(\.[\w-]+)+$',                                # 이메일만 있는 줄
+    r'^[가-힣]{2,4}\s*(기자|특파원)$',                               # "홍길동 기자"
+    r'^[\[(]\s*(사진|자료사진|그래픽|영상)\s*=?[^\])]{0,40}[\])]$',      # "[사진=연합뉴스]" 단독 줄
+    # 사진 설명: "…하고 있다." 로 끝나거나 서술어 없는 짧은 명사구 뒤에 출처 표기가 붙은 줄 ("…했다. [통계청 제공]" 같은 본문 문장은 유지)
+    r'^.{1,150}고\s*있다\.?\s*(/\s*(사진|그래픽)\s*=\s*\S{1,20}|[\[(]\s*[^\])]{0,20}(자료사진|제공)\s*[\])])$',
+    r'^[^.]{1,60}[^다.\s]\.?\s*(/\s*(사진|그래픽)\s*=\s*\S{1,20}|[\[(]\s*[^\])]{0,20}(자료사진|제공)\s*[\])])$',
+    r'^[▲△]\s*.{1,150}고\s*있다\.?$',                        # "▲ 이창용 총재가 … 하고 있다."
+]
+# ▲/△ 는 인사 명단 등 목록 기호로도 쓰이므로 "…하고 있다." 로 끝나는 사진 설명 형식만 제거합니다.
+
+# 줄 안에서 제거할 패턴 (통신사 기사 머리말, 문장 끝 사진/자료 출처 표기 등, 나머지 문장은 유지)
+DEFAULT_STRIP_PATTERNS = [
+    r'^[\[(][^\])=]{1,20}=[^\])]{1,20}[\])]\s*([가-힣]{2,4}\s*(기자|특파원)\s*=?)?\s*',  # "(서울=연합뉴스) 홍길동 기자 = "
+    r'\s*/\s*(사진|그래픽)\s*=\s*[^\s]{1,20}$',                        # 문장 끝 "/사진=뉴스1"
+    r'\s*[\[(]\s*[^\])]{0,20}(자료사진|제공)\s*[\])]$',                 # 문장 끝 "[연합뉴스 자료사진]", "[통계청 제공]"
+]
+
+def _compile(patterns):
+    return [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+_DEFAULT_DROP_LINE_RULES = _compile(DEFAULT_DROP_LINE_PATTERNS + PREPROCESS_EXTRA_DROP_LINE_PATTERNS)
+_DEFAULT_STRIP_RULES = _compile(DEFAULT_STRIP_PATTERNS + PREPROCESS_EXTRA_STRIP_PATTERNS)
+
+def estimate_tokens(text):
+    """공백을 제외한 글자 수 기반의 대략적인 토큰 수 추정 (네트워크 호출 없이 절감량 보고용)"""
+    return int(len(re.sub(r'\s+', '', text)) / ESTIMATED_CHARS_PER_TOKEN)
+
+def preprocess_article(article_text, drop_line_patterns=None, strip_patterns=None):
+    """AI 처리 전 기사 본문에서 상투적 문구를 제거하고 텍스트를 정규화
+
+    Args:
+        article_text: 크롤러가 가져온 기사 본문 텍스트
+        drop_line_patterns: 줄 전체를 제거할 정규식 리스트 (기본값: 기본 규칙 + config 추가 규칙)
+        strip_patterns: 줄 안에서 제거할 정규식 리스트 (기본값: 기본 규칙 + config 추가 규칙)
+
+    Returns:
+        (정리된 텍스트, 리포트 딕셔너리) 튜플
+        리포트는 {'original_tokens', 'cleaned_tokens', 'tokens_saved', 'removed_lines', 'fallback'}
+
+    규칙 적용 후 남은 내용이 원문의 PREPROCESS_MIN_KEEP_RATIO 미만이면 규칙이 본문까지 지운 것으로 보고,
+    공백만 정규화한 원문을 반환합니다 (리포트의 'fallback' 이 True).
+    """
+    drop_rules = _compile(drop_line_patterns) if drop_line_patterns is not None else _DEFAULT_DROP_LINE_RULES
+    strip_rules = _compile(strip_patterns) if strip_patterns is not None else _DEFAULT_STRIP_RULES
+
+    cleaned_lines = []
+    removed_lines = []
+    for raw_line in article_text.splitlines():
+        # 연속 공백 정규화
+        line = re.sub(r'\s+', ' ', raw_line).strip()
+        if not line:
+            continue
+
+        if any(rule.search(line) for rule in drop_rules):
+            removed_lines.append(line)
+            continue
+
+        for rule in strip_rules:
+            line = rule.sub('', line).strip()
+        if not line:
+            continue
+
+        # 바로 앞 줄과 같은 내용이 반복되면 제거
+        if cleaned_lines and cleaned_lines[-1] == line:
+            removed_lines.append(line)
+            continue
+
+        cleaned_lines.append(line)
+
+    cleaned_text = "\n".join(cleaned_lines)
+    original_tokens = estimate_tokens(article_text)
+    cleaned_tokens = estimate_tokens(cleaned_text)
+
+    fallback = cleaned_tokens < original_tokens * PREPROCESS_MIN_KEEP_RATIO
+    if fallback:
+        print(f"전처리 결과가 너무 짧아 원문을 사용합니다 (추정 토큰 {original_tokens} -> {cleaned_tokens})")
+        cleaned_text = "\n".join(
+            line for line in (re.sub(r'\s+', ' ', raw_line).strip() for raw_line in article_text.splitlines()) if line
+        )
+        cleaned_tokens = estimate_tokens(cleaned_text)
+        removed_lines = []
+
+    report = {
+        'original_tokens': original_tokens,
+        'cleaned_tokens': cleaned_tokens,
+        'tokens_saved': original_tokens - cleaned_tokens,
+        'removed_lines': removed_lines,
+        'fallback': fallback,
+    }
+    return cleaned_text, report
+
+def verify_corpus(corpus_path):
+    """픽스처 코퍼스로 전처리 규칙 검증 (사실 문장이 제거되지 않고, 상투적 문구는 제거되는지)
+
+    Args:
+        corpus_path: [{'name', 'text', 'facts', 'boilerplate'}] 형식의 JSON 파일 경로
+
+    Returns:
+        실패 내용 문자열 리스트 (모두 통과하면 빈 리스트)
+    """
+    with open(corpus_path, encoding='utf-8') as f:
+        corpus = json.load(f)
+
+    failures = []
+    for article in corpus:
+        cleaned_text, report = preprocess_article(article['text'])
+        for fact in article['facts']:
+            if fact not in cleaned_text:
+                failures.append(f"[{article['name']}] 사실 문장 누락: {fact}")
+        for boilerplate in article['boilerplate']:
+            if boilerplate in cleaned_text:
+                failures.append(f"[{article['name']}] 상투적 문구 잔존: {boilerplate}")
+        print(f"[{article['name']}] 토큰 {report['original_tokens']} -> {report['cleaned_tokens']} "
+              f"({report['tokens_saved']} 절감, 제거된 줄 {len(report['removed_lines'])}개)")
+    return failures
+
+# --- 픽스처 코퍼스 검증 ---
+if __name__ == '__main__':
+    corpus_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'preprocess_corpus.json')
+    failures = verify_corpus(corpus_path)
+
+    if failures:
+        print("\n검증 실패:")
+        for failure in failures:
+            print(" -", failure)
+        raise SystemExit(1)
+    print("\n모든 픽스처 기사 검증 통과")
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import Counter
+from config import QUERY_LOG_BATCH_SIZE, QUERY_LOG_FLUSH_SECONDS, QUERY_LOG_RETENTION_HOURS, TRENDING_WINDOW_HOURS
+from database import add_keyword_counts, get_trending_keywords
+
+# 아직 DB 에 기록되지 않은 검색 키워드 집계
+_pending_counts = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+def normalize_keyword(keyword):
+    """검색 키워드 정규화 (앞뒤/연속 공백 정리, 영문 소문자화)"""
+    return " ".join(keyword.split()).lower()
+
+def _current_hour_bucket():
+    return int(time.time() // 3600)
+
+def record_query(keyword):
+    """검색 키워드를 메모리에 모아 두고, 일정 개수나 시간이 지나면 한 번에 DB 에 기록
+
+    Args:
+        keyword: 사용자가 입력한 검색 키워드
+    """
+    normalized = normalize_keyword(keyword)
+    if not normalized:
+        return
+
+    with _pending_lock:
+        _pending_counts[normalized] += 1
+        should_flush = (
+            sum(_pending_counts.values()) >= QUERY_LOG_BATCH_SIZE
+            or time.monotonic() - _last_flush >= QUERY_LOG_FLUSH_SECONDS
+        )
+    if should_flush:
+        flush()
+
+def flush():
+    """모아 둔 검색 키워드 집계를 DB 에 기록"""
+    global _pending_counts, _last_flush
+    with _pending_lock:
+        counts, _pending_counts = _pending_counts, Counter()
+        _last_flush = time.monotonic()
+    if not counts:
+        return
+
+    hour_bucket = _current_hour_bucket()
+    try:
+        add_keyword_counts(counts.items(), hour_bucket, hour_bucket - QUERY_LOG_RETENTION_HOURS)
+    except Exception as e:
+        print(f"검색 키워드 기록 오류: {e}")
+        # 다음 기록 때 다시 시도
+        with _pending_lock:
+            _pending_counts.update(counts)
+
+def get_top_keywords(limit):
+    """최근 TRENDING_WINDOW_HOURS 동안 가장 많이 검색된 키워드 반환
+
+    Args:
+        limit: 반환할 최대 키워드 수
+
+    Returns:
+        정규화된 키워드 리스트 (검색 횟수 내림차순)
+    """
+    since_bucket = _current_hour_bucket() - TRENDING_WINDOW_HOURS + 1
+    return [keyword for keyword, _ in get_trending_keywords(since_bucket, limit)]
@@ -0,0 +1,105 @@
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# `python -X importtime` 출력 형식: "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)$")
+
+def measure_import(module_name="main"):
+    """새 인터프리터에서 모듈을 import 하며 -X importtime 기록을 수집
+
+    Args:
+        module_name: 시작 시간을 측정할 모듈 이름
+
+    Returns:
+        (import 항목 리스트, 전체 import 소요 시간(ms)) 튜플
+        각 항목은 {'module', 'depth', 'self_us', 'cumulative_us'} 딕셔너리
+    """
+    code = (
+        "import time\n"
+        "_t = time.perf_counter()\n"
+        f"import {module_name}\n"
+        "print((time.perf_counter() - _t) * 1000)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"'{module_name}' import 실패:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            'module': module,
+            'depth': (len(indent) - 1) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+
+    total_ms = float(proc.stdout.strip().splitlines()[-1])
+    return entries, total_ms
+
+def summarize_by_package(entries):
+    """최상위 패키지별 self 시간 합계 (해당 패키지가 시작 시간에 기여한 몫)"""
+    totals = defaultdict(int)
+    for entry in entries:
+        totals[entry['module'].split('.')[0]] += entry['self_us']
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def direct_imports(entries, module_name="main"):
+    """측정 대상 모듈이 직접 불러온 모듈들의 누적 시간
+
+    -X importtime 은 자식 모듈을 부모보다 먼저 출력하므로,
+    대상 모듈 바로 앞에 나오는 depth 1 항목들이 직접 import 입니다.
+    """
+    for idx, entry in enumerate(entries):
+        if entry['module'] == module_name and entry['depth'] == 0:
+            children = []
+            for child in reversed(entries[:idx]):
+                if child['depth'] == 0:
+                    break
+                if child['depth'] == 1:
+                    children.append((child['module'], child['cumulative_us']))
+            return sorted(children, key=lambda item: item[1], reverse=True)
+    return []
+
+def print_report(module_name="main", top=15):
+    """시작 시간 리포트 출력 후 전체 import 시간(ms) 반환"""
+    entries, total_ms = measure_import(module_name)
+
+    print(f"=== '{module_name}' 시작 시간 리포트 ===")
+    print(f"전체 import 시간: {total_ms:.1f} ms\n")
+
+    print("[직접 import 별 누적 시간]")
+    for module, cumulative_us in direct_imports(entries, module_name)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+    print(f"\n[패키지별 기여 시간 (self 합계, 상위 {top}개)]")
+    for package, self_us in summarize_by_package(entries)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    return total_ms
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="봇 시작(import) 시간을 측정하고 모듈별 기여도를 출력합니다.")
+    parser.add_argument("module", nargs="?", default="main", help="측정할 모듈 (기본값: main)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 항목 수")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="전체 import 시간 상한(ms). 초과하면 종료 코드 1 반환 (CI 용)")
+    args = parser.parse_args()
+
+    total_ms = print_report(args.module, args.top)
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\n시작 시간 예산 초과: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()